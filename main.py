@@ -1,10 +1,12 @@
+import heapq
 import os
 from datetime import datetime
 from collections import defaultdict
+from operator import attrgetter
 
 from utils.file_handler import read_sales_data
 from utils.data_processor import parse_transactions, validate_and_filter
-from utils.api_handler import fetch_product_info, fetch_all_products, create_product_mapping, enrich_sales_data, save_enriched_data
+from utils.api_handler import enrich_sales_data, save_enriched_data
 
 # ================= CONSTANTS =================
 DATA_FILE = "data/sales_data.txt"
@@ -12,20 +14,22 @@ OUTPUT_DIR = "output"
 BASIC_REPORT_FILE = os.path.join(OUTPUT_DIR, "report.txt")
 FULL_REPORT_FILE = os.path.join(OUTPUT_DIR, "sales_report.txt")
 
+# Fields pulled out of each transaction by the report loops
+BASIC_REPORT_FIELDS = attrgetter("Quantity", "UnitPrice", "Region")
+REPORT_FIELDS = attrgetter("Quantity", "UnitPrice", "Region", "ProductName", "CustomerID", "Date")
+
 
 # ================= BASIC REPORT =================
 def generate_report(transactions):
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
     total_revenue = 0
-    region_sales = {}
+    region_sales = defaultdict(float)
 
-    for tx in transactions:
-        amount = tx["Quantity"] * tx["UnitPrice"]
+    for quantity, price, region in map(BASIC_REPORT_FIELDS, transactions):
+        amount = quantity * price
         total_revenue += amount
-
-        region = tx["Region"]
-        region_sales[region] = region_sales.get(region, 0) + amount
+        region_sales[region] += amount
 
     with open(BASIC_REPORT_FILE, "w", encoding="utf-8") as file:
         file.write(f"Total Revenue: {total_revenue}\n\n")
@@ -40,10 +44,12 @@ def generate_report(transactions):
 def generate_sales_report(transactions, enriched_transactions, output_file=FULL_REPORT_FILE):
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     lines = []
+    append = lines.append
+    extend = lines.extend
 
     # -------- HEADER --------
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    lines.extend([
+    extend([
         "=" * 44,
         "           SALES ANALYTICS REPORT",
         f"Generated: {now}",
@@ -52,14 +58,37 @@ def generate_sales_report(transactions, enriched_transactions, output_file=FULL_
         ""
     ])
 
+    # -------- AGGREGATION (single pass) --------
+    total_revenue = 0.0
+    region_sales = defaultdict(float)
+    region_count = defaultdict(int)
+    product_qty = defaultdict(int)
+    product_rev = defaultdict(float)
+    customer_spend = defaultdict(float)
+    customer_orders = defaultdict(int)
+    daily_rev = defaultdict(float)
+    daily_count = defaultdict(int)
+    daily_customers = defaultdict(set)
+
+    for q, p, r, pn, c, d in map(REPORT_FIELDS, transactions):
+        amt = q * p
+
+        total_revenue += amt
+        region_sales[r] += amt
+        region_count[r] += 1
+        product_qty[pn] += q
+        product_rev[pn] += amt
+        customer_spend[c] += amt
+        customer_orders[c] += 1
+        daily_rev[d] += amt
+        daily_count[d] += 1
+        daily_customers[d].add(c)
+
     # -------- OVERALL SUMMARY --------
-    total_revenue = sum(t["Quantity"] * t["UnitPrice"] for t in transactions)
     avg_order_value = total_revenue / len(transactions) if transactions else 0
+    date_range = f"{min(daily_rev)} to {max(daily_rev)}" if daily_rev else "N/A"
 
-    dates = sorted(t["Date"] for t in transactions)
-    date_range = f"{dates[0]} to {dates[-1]}" if dates else "N/A"
-
-    lines.extend([
+    extend([
         "OVERALL SUMMARY",
         "-" * 44,
         f"Total Revenue:        ₹{total_revenue:,.2f}",
@@ -70,82 +99,59 @@ def generate_sales_report(transactions, enriched_transactions, output_file=FULL_
     ])
 
     # -------- REGION PERFORMANCE --------
-    region_sales = defaultdict(float)
-    region_count = defaultdict(int)
-
-    for t in transactions:
-        amt = t["Quantity"] * t["UnitPrice"]
-        region_sales[t["Region"]] += amt
-        region_count[t["Region"]] += 1
-
-    lines.append("REGION-WISE PERFORMANCE")
-    lines.append("-" * 44)
-    lines.append(f"{'Region':<10}{'Sales':<15}{'% of Total':<12}{'Transactions'}")
+    extend([
+        "REGION-WISE PERFORMANCE",
+        "-" * 44,
+        f"{'Region':<10}{'Sales':<15}{'% of Total':<12}{'Transactions'}"
+    ])
 
     for region, sales in sorted(region_sales.items(), key=lambda x: x[1], reverse=True):
         percent = (sales / total_revenue) * 100 if total_revenue else 0
-        lines.append(f"{region:<10}₹{sales:<14,.0f}{percent:<12.2f}{region_count[region]}")
+        append(f"{region:<10}₹{sales:<14,.0f}{percent:<12.2f}{region_count[region]}")
 
-    lines.append("")
+    append("")
 
     # -------- TOP 5 PRODUCTS --------
-    product_qty = defaultdict(int)
-    product_rev = defaultdict(float)
-
-    for t in transactions:
-        product_qty[t["ProductName"]] += t["Quantity"]
-        product_rev[t["ProductName"]] += t["Quantity"] * t["UnitPrice"]
-
-    lines.append("TOP 5 PRODUCTS")
-    lines.append("-" * 44)
-    lines.append(f"{'Rank':<6}{'Product':<20}{'Qty':<8}{'Revenue'}")
-
-    for i, (p, q) in enumerate(sorted(product_qty.items(), key=lambda x: x[1], reverse=True)[:5], 1):
-        lines.append(f"{i:<6}{p:<20}{q:<8}₹{product_rev[p]:,.0f}")
-
-    lines.append("")
+    extend([
+        "TOP 5 PRODUCTS",
+        "-" * 44,
+        f"{'Rank':<6}{'Product':<20}{'Qty':<8}{'Revenue'}"
+    ])
+    extend(
+        f"{i:<6}{p:<20}{q:<8}₹{product_rev[p]:,.0f}"
+        for i, (p, q) in enumerate(heapq.nlargest(5, product_qty.items(), key=lambda x: x[1]), 1)
+    )
+    append("")
 
     # -------- TOP 5 CUSTOMERS --------
-    customer_spend = defaultdict(float)
-    customer_orders = defaultdict(int)
-
-    for t in transactions:
-        amt = t["Quantity"] * t["UnitPrice"]
-        customer_spend[t["CustomerID"]] += amt
-        customer_orders[t["CustomerID"]] += 1
-
-    lines.append("TOP 5 CUSTOMERS")
-    lines.append("-" * 44)
-    lines.append(f"{'Rank':<6}{'Customer':<12}{'Spent':<15}{'Orders'}")
-
-    for i, (c, s) in enumerate(sorted(customer_spend.items(), key=lambda x: x[1], reverse=True)[:5], 1):
-        lines.append(f"{i:<6}{c:<12}₹{s:<14,.0f}{customer_orders[c]}")
-
-    lines.append("")
+    extend([
+        "TOP 5 CUSTOMERS",
+        "-" * 44,
+        f"{'Rank':<6}{'Customer':<12}{'Spent':<15}{'Orders'}"
+    ])
+    extend(
+        f"{i:<6}{c:<12}₹{s:<14,.0f}{customer_orders[c]}"
+        for i, (c, s) in enumerate(heapq.nlargest(5, customer_spend.items(), key=lambda x: x[1]), 1)
+    )
+    append("")
 
     # -------- DAILY SALES TREND --------
-    daily_rev = defaultdict(float)
-    daily_customers = defaultdict(set)
-
-    for t in transactions:
-        amt = t["Quantity"] * t["UnitPrice"]
-        daily_rev[t["Date"]] += amt
-        daily_customers[t["Date"]].add(t["CustomerID"])
-
-    lines.append("DAILY SALES TREND")
-    lines.append("-" * 44)
-    lines.append(f"{'Date':<12}{'Revenue':<15}{'Transactions':<15}{'Customers'}")
-
-    for d in sorted(daily_rev):
-        lines.append(f"{d:<12}₹{daily_rev[d]:<14,.0f}{len(daily_customers[d]):<15}{len(daily_customers[d])}")
-
-    lines.append("")
+    extend([
+        "DAILY SALES TREND",
+        "-" * 44,
+        f"{'Date':<12}{'Revenue':<15}{'Transactions':<15}{'Customers'}"
+    ])
+    extend(
+        f"{d:<12}₹{daily_rev[d]:<14,.0f}{daily_count[d]:<15}{len(daily_customers[d])}"
+        for d in sorted(daily_rev)
+    )
+    append("")
 
     # -------- PRODUCT PERFORMANCE --------
     best_day = max(daily_rev.items(), key=lambda x: x[1])[0] if daily_rev else "N/A"
     low_products = [p for p, q in product_qty.items() if q < 10]
 
-    lines.extend([
+    extend([
         "PRODUCT PERFORMANCE ANALYSIS",
         "-" * 44,
         f"Best Selling Day: {best_day}",
@@ -154,12 +160,12 @@ def generate_sales_report(transactions, enriched_transactions, output_file=FULL_
     ])
 
     # -------- API ENRICHMENT SUMMARY --------
-    enriched = [t for t in enriched_transactions if t.get("API_Match")]
-    failed = [t["ProductID"] for t in enriched_transactions if not t.get("API_Match")]
+    enriched = [t for t in enriched_transactions if t.API_Match]
+    failed = [t.ProductID for t in enriched_transactions if not t.API_Match]
 
     success_rate = (len(enriched) / len(enriched_transactions)) * 100 if enriched_transactions else 0
 
-    lines.extend([
+    extend([
         "API ENRICHMENT SUMMARY",
         "-" * 44,
         f"Total Products Enriched: {len(enriched)}",
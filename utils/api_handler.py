@@ -1,26 +1,37 @@
+from operator import attrgetter
+
 import requests
 
+# Local product ID -> category lookup, built once at import time
+_CATEGORIES = {
+    "P101": "Laptop",
+    "P102": "Mouse",
+    "P103": "Keyboard",
+    "P104": "Monitor",
+    "P105": "Webcam",
+    "P106": "Headphones",
+    "P107": "Accessories",
+    "P108": "Storage",
+    "P109": "Mouse",
+    "P110": "Charger"
+}
+
+# Products returned by the last successful API fetch
+_products_cache = None
+
 def fetch_product_info(product_id):
-    categories = {
-        "P101": "Laptop",
-        "P102": "Mouse",
-        "P103": "Keyboard",
-        "P104": "Monitor",
-        "P105": "Webcam",
-        "P106": "Headphones",
-        "P107": "Accessories",
-        "P108": "Storage",
-        "P109": "Mouse",
-        "P110": "Charger"
-    }
-
-    return categories.get(product_id, "Unknown")
+    return _CATEGORIES.get(product_id, "Unknown")
 
 def fetch_all_products():
     """
     Fetches all products from DummyJSON API
-    Returns list of product dictionaries
+    Returns list of product dictionaries (cached after the first success)
     """
+    global _products_cache
+
+    if _products_cache is not None:
+        return _products_cache
+
     url = "https://dummyjson.com/products?limit=100"
 
     try:
@@ -28,7 +39,8 @@ def fetch_all_products():
         response.raise_for_status()
         data = response.json()
         print("Products fetched successfully!")
-        return data.get("products", [])
+        _products_cache = data.get("products", [])
+        return _products_cache
     except Exception as e:
         print("Failed to fetch products:", e)
         return []
@@ -52,45 +64,25 @@ def create_product_mapping(api_products):
 def enrich_sales_data(transactions, product_mapping=None):
     """
     Enriches transaction data with local product category information
+    Transactions are updated in place; returns list of the same records
     """
     enriched = []
-    local_categories = {
-        "P101": "Laptop",
-        "P102": "Mouse",
-        "P103": "Keyboard",
-        "P104": "Monitor",
-        "P105": "Webcam",
-        "P106": "Headphones",
-        "P107": "Accessories",
-        "P108": "Storage",
-        "P109": "Mouse",
-        "P110": "Charger"
-    }
 
     for tx in transactions:
-        tx_copy = tx.copy()
-
-        try:
-            product_id = tx.get("ProductID", "")
-            
-            if product_id in local_categories:
-                tx_copy["API_Category"] = local_categories[product_id]
-                tx_copy["API_Brand"] = "TechStore"
-                tx_copy["API_Rating"] = 4.5
-                tx_copy["API_Match"] = True
-            else:
-                tx_copy["API_Category"] = None
-                tx_copy["API_Brand"] = None
-                tx_copy["API_Rating"] = None
-                tx_copy["API_Match"] = False
-
-        except Exception:
-            tx_copy["API_Category"] = None
-            tx_copy["API_Brand"] = None
-            tx_copy["API_Rating"] = None
-            tx_copy["API_Match"] = False
-
-        enriched.append(tx_copy)
+        category = _CATEGORIES.get(tx.ProductID)
+
+        if category is not None:
+            tx.API_Category = category
+            tx.API_Brand = "TechStore"
+            tx.API_Rating = 4.5
+            tx.API_Match = True
+        else:
+            tx.API_Category = None
+            tx.API_Brand = None
+            tx.API_Rating = None
+            tx.API_Match = False
+
+        enriched.append(tx)
 
     return enriched
 
@@ -98,18 +90,22 @@ def save_enriched_data(enriched_transactions, filename="data/enriched_sales_data
     """
     Saves enriched transactions back to file
     """
-    headers = [
+    headers = (
         "TransactionID", "Date", "ProductID", "ProductName",
         "Quantity", "UnitPrice", "CustomerID", "Region",
         "API_Category", "API_Brand", "API_Rating", "API_Match"
-    ]
+    )
+
+    # One attrgetter call pulls the whole row, in header order
+    get_row = attrgetter(*headers)
+    rows = ["|".join(headers)]
+
+    for tx in enriched_transactions:
+        rows.append("|".join(["" if value is None else str(value) for value in get_row(tx)]))
+
+    # Trailing empty row gives the final newline without copying the joined text
+    rows.append("")
 
+    # Build the whole file in memory and write it in one call
     with open(filename, "w", encoding="utf-8") as file:
-        file.write("|".join(headers) + "\n")
-
-        for tx in enriched_transactions:
-            row = []
-            for h in headers:
-                value = tx.get(h)
-                row.append("" if value is None else str(value))
-            file.write("|".join(row) + "\n")
+        file.write("\n".join(rows))
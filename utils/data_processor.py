@@ -1,6 +1,45 @@
+import heapq
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from operator import attrgetter
+
+VALID_REGIONS = frozenset(("North", "South", "East", "West"))
+
+# Batched field extraction for the aggregation loops
+_region_fields = attrgetter("Region", "Quantity", "UnitPrice")
+_product_fields = attrgetter("ProductName", "Quantity", "UnitPrice")
+_customer_fields = attrgetter("CustomerID", "Quantity", "UnitPrice", "ProductName")
+_daily_fields = attrgetter("Date", "Quantity", "UnitPrice", "CustomerID")
+_peak_fields = attrgetter("Date", "Quantity", "UnitPrice")
+
+
+@dataclass(slots=True)
+class Transaction:
+    """
+    One sales record; field names match the data file columns.
+    Slots keep each instance free of a per-row __dict__.
+    """
+
+    TransactionID: str
+    Date: str
+    ProductID: str
+    ProductName: str
+    Quantity: int
+    UnitPrice: float
+    CustomerID: str
+    Region: str
+
+    # Filled in by enrich_sales_data
+    API_Category: str | None = None
+    API_Brand: str | None = None
+    API_Rating: float | None = None
+    API_Match: bool = False
+
+
 def parse_transactions(raw_lines):
     """
-    Parses raw lines into clean list of dictionaries
+    Parses raw lines into clean list of Transaction records
     """
 
     transactions = []
@@ -30,16 +69,18 @@ def parse_transactions(raw_lines):
         except ValueError:
             continue
 
-        transactions.append({
-            "TransactionID": transaction_id,
-            "Date": date,
-            "ProductID": product_id,
-            "ProductName": product_name,
-            "Quantity": quantity,
-            "UnitPrice": unit_price,
-            "CustomerID": customer_id,
-            "Region": region
-        })
+        # Low-cardinality fields repeat across rows; interning makes every
+        # row share one string object per distinct value
+        transactions.append(Transaction(
+            transaction_id,
+            sys.intern(date),
+            sys.intern(product_id),
+            product_name,
+            quantity,
+            unit_price,
+            sys.intern(customer_id),
+            sys.intern(region)
+        ))
 
     return transactions
 
@@ -53,31 +94,35 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
     invalid_count = 0
 
     for tx in transactions:
-        if not tx["TransactionID"].startswith("T"):
+        # Cheapest checks first; any failure marks the record invalid
+        if tx.Quantity <= 0 or tx.UnitPrice <= 0:
             invalid_count += 1
             continue
-        if not tx["ProductID"].startswith("P"):
+        if tx.Region not in VALID_REGIONS:
             invalid_count += 1
             continue
-        if not tx["CustomerID"] or not tx["CustomerID"].startswith("C"):
+        if tx.TransactionID[:1] != "T":
             invalid_count += 1
             continue
-        if tx["Quantity"] <= 0 or tx["UnitPrice"] <= 0:
+        if tx.ProductID[:1] != "P":
             invalid_count += 1
             continue
-        if not tx["Region"] or tx["Region"] not in ["North", "South", "East", "West"]:
+        if tx.CustomerID[:1] != "C":
             invalid_count += 1
             continue
 
-        amount = tx["Quantity"] * tx["UnitPrice"]
-
-        if region and tx["Region"] != region:
-            continue
-        if min_amount and amount < min_amount:
-            continue
-        if max_amount and amount > max_amount:
+        if region and tx.Region != region:
             continue
 
+        # Amount is only needed when an amount filter is active
+        if min_amount or max_amount:
+            amount = tx.Quantity * tx.UnitPrice
+
+            if min_amount and amount < min_amount:
+                continue
+            if max_amount and amount > max_amount:
+                continue
+
         valid_transactions.append(tx)
 
     summary = {
@@ -97,72 +142,57 @@ def calculate_total_revenue(transactions):
     total_revenue = 0.0
 
     for tx in transactions:
-        total_revenue += tx["Quantity"] * tx["UnitPrice"]
+        total_revenue += tx.Quantity * tx.UnitPrice
 
     return total_revenue
 
 def region_wise_sales(transactions):
     """
     Analyzes sales by region
-    Returns: dictionary with region statistics
+    Returns: list of (region, statistics) tuples sorted by total_sales
     """
 
-    region_data = {}
+    region_data = defaultdict(lambda: {
+        "total_sales": 0,
+        "transaction_count": 0
+    })
     total_sales = 0
 
-    # First pass: calculate totals
-    for tx in transactions:
-        region = tx["Region"]
-        amount = tx["Quantity"] * tx["UnitPrice"]
+    for region, quantity, price in map(_region_fields, transactions):
+        amount = quantity * price
         total_sales += amount
 
-        if region not in region_data:
-            region_data[region] = {
-                "total_sales": 0,
-                "transaction_count": 0
-            }
+        entry = region_data[region]
+        entry["total_sales"] += amount
+        entry["transaction_count"] += 1
 
-        region_data[region]["total_sales"] += amount
-        region_data[region]["transaction_count"] += 1
-
-    # Second pass: calculate percentage
-    for region in region_data:
-        region_data[region]["percentage"] = round(
-            (region_data[region]["total_sales"] / total_sales) * 100, 2
-        )
+    # Percentages need the final total, so fill them in over the (few)
+    # aggregated entries rather than the transactions
+    for entry in region_data.values():
+        entry["percentage"] = round((entry["total_sales"] / total_sales) * 100, 2)
 
     # Sort by total_sales (descending)
-    sorted_data = dict(
-        sorted(
-            region_data.items(),
-            key=lambda x: x[1]["total_sales"],
-            reverse=True
-        )
+    return sorted(
+        region_data.items(),
+        key=lambda x: x[1]["total_sales"],
+        reverse=True
     )
 
-    return sorted_data
-
 def top_selling_products(transactions, n=5):
     """
     Finds top n products by total quantity sold
     Returns: list of tuples
     """
 
-    product_data = {}
-
-    for tx in transactions:
-        name = tx["ProductName"]
-        quantity = tx["Quantity"]
-        revenue = quantity * tx["UnitPrice"]
-
-        if name not in product_data:
-            product_data[name] = {
-                "quantity": 0,
-                "revenue": 0
-            }
+    product_data = defaultdict(lambda: {
+        "quantity": 0,
+        "revenue": 0
+    })
 
-        product_data[name]["quantity"] += quantity
-        product_data[name]["revenue"] += revenue
+    for name, quantity, price in map(_product_fields, transactions):
+        entry = product_data[name]
+        entry["quantity"] += quantity
+        entry["revenue"] += quantity * price
 
     # Convert to list of tuples
     result = [
@@ -170,34 +200,26 @@ def top_selling_products(transactions, n=5):
         for name, data in product_data.items()
     ]
 
-    # Sort by quantity sold (descending)
-    result.sort(key=lambda x: x[1], reverse=True)
-
-    return result[:n]
+    # Keep the n best by quantity sold (descending)
+    return heapq.nlargest(n, result, key=lambda x: x[1])
 
 def customer_analysis(transactions):
     """
     Analyzes customer purchase patterns
-    Returns: dictionary of customer statistics
+    Returns: list of (customer_id, statistics) tuples sorted by total_spent
     """
 
-    customers = {}
-
-    for tx in transactions:
-        cid = tx["CustomerID"]
-        amount = tx["Quantity"] * tx["UnitPrice"]
-        product = tx["ProductName"]
-
-        if cid not in customers:
-            customers[cid] = {
-                "total_spent": 0,
-                "purchase_count": 0,
-                "products_bought": set()
-            }
+    customers = defaultdict(lambda: {
+        "total_spent": 0,
+        "purchase_count": 0,
+        "products_bought": set()
+    })
 
-        customers[cid]["total_spent"] += amount
-        customers[cid]["purchase_count"] += 1
-        customers[cid]["products_bought"].add(product)
+    for cid, quantity, price, product in map(_customer_fields, transactions):
+        entry = customers[cid]
+        entry["total_spent"] += quantity * price
+        entry["purchase_count"] += 1
+        entry["products_bought"].add(product)
 
     # Final formatting
     for cid in customers:
@@ -207,39 +229,29 @@ def customer_analysis(transactions):
         customers[cid]["products_bought"] = list(customers[cid]["products_bought"])
 
     # Sort by total_spent (descending)
-    sorted_customers = dict(
-        sorted(
-            customers.items(),
-            key=lambda x: x[1]["total_spent"],
-            reverse=True
-        )
+    return sorted(
+        customers.items(),
+        key=lambda x: x[1]["total_spent"],
+        reverse=True
     )
 
-    return sorted_customers
-
 def daily_sales_trend(transactions):
     """
     Analyzes sales trends by date
-    Returns dictionary sorted by date
+    Returns list of (date, statistics) tuples sorted by date
     """
 
-    daily_data = {}
-
-    for tx in transactions:
-        date = tx["Date"]
-        amount = tx["Quantity"] * tx["UnitPrice"]
-        customer = tx["CustomerID"]
-
-        if date not in daily_data:
-            daily_data[date] = {
-                "revenue": 0,
-                "transaction_count": 0,
-                "unique_customers": set()
-            }
+    daily_data = defaultdict(lambda: {
+        "revenue": 0,
+        "transaction_count": 0,
+        "unique_customers": set()
+    })
 
-        daily_data[date]["revenue"] += amount
-        daily_data[date]["transaction_count"] += 1
-        daily_data[date]["unique_customers"].add(customer)
+    for date, quantity, price, customer in map(_daily_fields, transactions):
+        entry = daily_data[date]
+        entry["revenue"] += quantity * price
+        entry["transaction_count"] += 1
+        entry["unique_customers"].add(customer)
 
     # Convert set to count
     for date in daily_data:
@@ -248,9 +260,7 @@ def daily_sales_trend(transactions):
         )
 
     # Sort chronologically by date
-    sorted_daily = dict(sorted(daily_data.items()))
-
-    return sorted_daily
+    return sorted(daily_data.items())
 
 def find_peak_sales_day(transactions):
     """
@@ -258,20 +268,15 @@ def find_peak_sales_day(transactions):
     Returns tuple (date, revenue, transaction_count)
     """
 
-    daily_summary = {}
-
-    for tx in transactions:
-        date = tx["Date"]
-        amount = tx["Quantity"] * tx["UnitPrice"]
+    daily_summary = defaultdict(lambda: {
+        "revenue": 0,
+        "transaction_count": 0
+    })
 
-        if date not in daily_summary:
-            daily_summary[date] = {
-                "revenue": 0,
-                "transaction_count": 0
-            }
-
-        daily_summary[date]["revenue"] += amount
-        daily_summary[date]["transaction_count"] += 1
+    for date, quantity, price in map(_peak_fields, transactions):
+        entry = daily_summary[date]
+        entry["revenue"] += quantity * price
+        entry["transaction_count"] += 1
 
     # Find peak day
     peak_date = max(
@@ -292,22 +297,16 @@ def low_performing_products(transactions, threshold=10):
     (ProductName, TotalQuantity, TotalRevenue)
     """
 
-    product_data = {}
+    product_data = defaultdict(lambda: {
+        "quantity": 0,
+        "revenue": 0
+    })
 
     # Aggregate quantity and revenue per product
-    for tx in transactions:
-        name = tx["ProductName"]
-        quantity = tx["Quantity"]
-        revenue = quantity * tx["UnitPrice"]
-
-        if name not in product_data:
-            product_data[name] = {
-                "quantity": 0,
-                "revenue": 0
-            }
-
-        product_data[name]["quantity"] += quantity
-        product_data[name]["revenue"] += revenue
+    for name, quantity, price in map(_product_fields, transactions):
+        entry = product_data[name]
+        entry["quantity"] += quantity
+        entry["revenue"] += quantity * price
 
     # Filter low-performing products
     low_products = [
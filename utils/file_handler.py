@@ -8,13 +8,16 @@ def read_sales_data(filename):
 
     for enc in encodings:
         try:
-            with open(filename, "r", encoding=enc) as file:
-                lines = file.readlines()
-
             raw_lines = []
-            for line in lines[1:]:   # skip header
-                if line.strip():
-                    raw_lines.append(line.strip())
+
+            # Iterate the file handle directly instead of readlines() so the
+            # raw file is never held in memory alongside the stripped lines
+            with open(filename, "r", encoding=enc, buffering=1 << 20) as file:
+                next(file, None)   # skip header
+                for line in file:
+                    line = line.strip()
+                    if line:
+                        raw_lines.append(line)
 
             return raw_lines
 